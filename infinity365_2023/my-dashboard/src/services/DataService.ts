@@ -12,15 +12,23 @@ const AADClientID: string = "api://316be047-7c44-48d0-ab33-0f21043eec7a";
 export class DataService {
     private ctx: WebPartContext;
     private apiclient: AadHttpClient;
+    private apiclientRequest: Promise<AadHttpClient>;
 
     constructor(ctx: | WebPartContext) {
         this.ctx = ctx;
     }
 
     private async InitAADClient(): Promise<void> {
-        if (!this.apiclient) {
-            this.apiclient = await this.ctx.aadHttpClientFactory.getClient(AADClientID);
+        // share one pending getClient call between concurrent callers; a failed
+        // request is dropped so the next call tries again
+        if (!this.apiclientRequest) {
+            this.apiclientRequest = this.ctx.aadHttpClientFactory.getClient(AADClientID)
+                .catch((ex) => {
+                    this.apiclientRequest = undefined;
+                    throw ex;
+                });
         }
+        this.apiclient = await this.apiclientRequest;
     }
 
     // eslint-disable-next-line @typescript-eslint/no-explicit-any
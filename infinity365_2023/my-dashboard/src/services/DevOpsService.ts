@@ -1,21 +1,61 @@
 import { WebPartContext } from "@microsoft/sp-webpart-base";
-import { AadHttpClient } from '@microsoft/sp-http';
+import { AadHttpClient, HttpClientResponse } from '@microsoft/sp-http';
 import { IAzdoAccount, IAzdoProfile, IAzdoWorkItemReference, IWorkItemValue } from "./IAzureDevOps";
 
 
 const devOpsEndPointID: string = "499b84ac-1321-427f-aa17-267ca6975798";
+const workItemBatchSize: number = 200;
+const maxThrottleRetries: number = 3;
+const maxRetryDelaySeconds: number = 30;
+const retryableStatusCodes: number[] = [429, 503];
+// same WIQL body for every organization, serialized once
+const assignedTasksQuery: string = JSON.stringify({
+  query: "SELECT"
+    + "[System.Id]"
+    + " FROM WorkItems"
+    + " WHERE [System.WorkItemType] = 'Task'"
+    + " AND [State] <> 'Closed'"
+    + " AND [State] <> 'Removed'"
+    + " AND [System.AssignedTo] = @Me"
+});
 
 export class DevOpsService {
   private ctx: WebPartContext;
   private apiclient: AadHttpClient;
+  private apiclientRequest: Promise<AadHttpClient>;
   constructor(ctx: | WebPartContext) {
     this.ctx = ctx;
   }
 
   private async InitAADClient(): Promise<void> {
-    if (!this.apiclient) {
-      this.apiclient = await this.ctx.aadHttpClientFactory.getClient(devOpsEndPointID);
+    // share one pending getClient call between concurrent callers; a failed
+    // request is dropped so the next call tries again
+    if (!this.apiclientRequest) {
+      this.apiclientRequest = this.ctx.aadHttpClientFactory.getClient(devOpsEndPointID)
+        .catch((ex) => {
+          this.apiclientRequest = undefined;
+          throw ex;
+        });
     }
+    this.apiclient = await this.apiclientRequest;
+  }
+
+  // Azure DevOps answers 429/503 with a Retry-After header (seconds) when throttling,
+  // any other status is returned to the caller as is. Waits are capped so a long
+  // Retry-After does not keep the web part loading indefinitely
+  private async SendWithRetry(send: () => Promise<HttpClientResponse>): Promise<HttpClientResponse> {
+    let attempt = 0;
+    let response = await send();
+    while (retryableStatusCodes.indexOf(response.status) !== -1 && attempt < maxThrottleRetries) {
+      const retryAfter = parseInt(response.headers.get('Retry-After'), 10);
+      const delay = Math.min(isNaN(retryAfter) ? Math.pow(2, attempt) : retryAfter, maxRetryDelaySeconds);
+      // jitter so parallel organization requests do not retry in lockstep
+      const jitter = delay * Math.random() * 0.1;
+      await new Promise<void>(resolve => setTimeout(resolve, (delay + jitter) * 1000));
+      attempt++;
+      response = await send();
+    }
+    return response;
   }
 
   async getDevOpsTasks(): Promise<IWorkItemValue[]> {
@@ -25,9 +65,19 @@ export class DevOpsService {
     try {
       const profile = await this.getProfile();
       const accounts = await this.getAccounts(profile.id);
-      for (const account of accounts) {
-        const queryResult = await this.getAssignedTasks(account.accountName);
-        tasks.push(...(await this.getTasks(account.accountName, queryResult.map(x => x.id))));
+      // organizations are independent, query them in parallel; an organization the
+      // user cannot query must not hide the tasks of the others
+      const accountTasks = await Promise.all(accounts.map(async account => {
+        try {
+          const queryResult = await this.getAssignedTasks(account.accountName);
+          return await this.getTasks(account.accountName, queryResult.map(x => x.id));
+        } catch (ex) {
+          console.log(ex);
+          return [] as IWorkItemValue[];
+        }
+      }));
+      for (const items of accountTasks) {
+        tasks.push(...items);
       }
     } catch (ex) {
       console.log(ex);
@@ -39,57 +89,55 @@ export class DevOpsService {
 
   public async getProfile(): Promise<IAzdoProfile> {
     await this.InitAADClient();
-    const response = await this.apiclient.get(
+    const response = await this.SendWithRetry(() => this.apiclient.get(
       'https://app.vssps.visualstudio.com/_apis/profile/profiles/me?api-version=7.1-preview.3',
-      AadHttpClient.configurations.v1);
+      AadHttpClient.configurations.v1));
     const json = await response.json();
     return json as IAzdoProfile;
   }
 
   public async getAccounts(memberId: string): Promise<IAzdoAccount[]> {
     await this.InitAADClient();
-    const response = await this.apiclient.get(
+    const response = await this.SendWithRetry(() => this.apiclient.get(
       `https://app.vssps.visualstudio.com/_apis/accounts?memberId=${memberId}&api-version=7.1-preview.1`,
-      AadHttpClient.configurations.v1);
+      AadHttpClient.configurations.v1));
     const json = await response.json();
     return json.value as IAzdoAccount[];
   }
 
   public async getAssignedTasks(organizationName: string): Promise<IAzdoWorkItemReference[]> {
     await this.InitAADClient();
-    const response = await this.apiclient.post(
+    const response = await this.SendWithRetry(() => this.apiclient.post(
       `https://dev.azure.com/${organizationName}/_apis/wit/wiql?api-version=7.0`,
       AadHttpClient.configurations.v1,
       {
         headers: {
           'Content-Type': 'application/json'
         },
-        body: JSON.stringify({
-          query: "SELECT"
-            + "[System.Id]"
-            + " FROM WorkItems"
-            + " WHERE [System.WorkItemType] = 'Task'"
-            + " AND [State] <> 'Closed'"
-            + " AND [State] <> 'Removed'"
-            + " AND [System.AssignedTo] = @Me"
-        })
-      });
+        body: assignedTasksQuery
+      }));
     const json = await response.json();
     return json.workItems as IAzdoWorkItemReference[];
   }
 
   public async getTasks(organizationName: string, ids: number[]): Promise<IWorkItemValue[]> {
     await this.InitAADClient();
-    const response = await this.apiclient.get(
-      `https://dev.azure.com/${organizationName}/_apis/wit/workitems?ids=${ids.join(',')}&$expand=all&api-version=7.0`,
-      AadHttpClient.configurations.v1,
-      {
-        headers: {
-          'Content-Type': 'application/json'
-        }
-      });
-    const json = await response.json();
-    return json.value as IWorkItemValue[];
+    // the workitems endpoint accepts at most 200 ids per request
+    const tasks: IWorkItemValue[] = [];
+    for (let i = 0; i < ids.length; i += workItemBatchSize) {
+      const batch = ids.slice(i, i + workItemBatchSize);
+      const response = await this.SendWithRetry(() => this.apiclient.get(
+        `https://dev.azure.com/${organizationName}/_apis/wit/workitems?ids=${batch.join(',')}&api-version=7.0`,
+        AadHttpClient.configurations.v1,
+        {
+          headers: {
+            'Content-Type': 'application/json'
+          }
+        }));
+      const json = await response.json();
+      tasks.push(...(json.value as IWorkItemValue[]));
+    }
+    return tasks;
   }
 
 }
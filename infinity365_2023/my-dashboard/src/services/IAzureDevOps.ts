@@ -27,7 +27,7 @@ export interface IAzdoProfile {
     rev:        number;
     fields:     IValueFields;
     relations?: any[];
-    _links:     IValueLinks;
+    _links?:    IValueLinks;
     url:        string;
 }
 export interface IValueLinks {
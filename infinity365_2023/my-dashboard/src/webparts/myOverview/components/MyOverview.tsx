@@ -32,10 +32,11 @@ export default class MyOverview extends React.Component<IMyOverviewProps, IMyOve
 
   private async getData(): Promise<void> {
     
-    const tickets = await this.svc.getMyTickets().catch((ex)=>{console.log(ex); return [];});
-    let tasks = await this.dsvc.getDevOpsTasks().catch((ex)=>{console.log(ex); return [];});
-    if(tasks.length>5)
-     tasks=tasks.slice(0,5);
+    const [tickets, allTasks] = await Promise.all([
+      this.svc.getMyTickets().catch((ex)=>{console.log(ex); return [];}),
+      this.dsvc.getDevOpsTasks().catch((ex)=>{console.log(ex); return [];})
+    ]);
+    const tasks = allTasks.slice(0, 5);
     this.setState({
       tasks: tasks ,
       tickets: tickets